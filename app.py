@@ -6,28 +6,40 @@ Developer: Digamber Raj
 """
 
 import os
+import io
 import asyncio
 import aiohttp
+import copy
+import functools
 import json
+import logging
+import logging.handlers
+import queue
 import random
+import signal
 import sys
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Mapping, Tuple, Callable, Awaitable
 
 import discord
+from aiohttp import web
 from discord.ext import commands
-from flask import Flask, request, jsonify
 
 from utils import (
     get_player_status,
+    get_session,
+    close_session,
     build_embed_response,
     load_translations,
-    get_guild_count,
     validate_player_id,
     BANNED_EMOJI,
     NOT_BANNED_EMOJI,
-    save_bot_config,
+    save_bot_config_async,
     load_bot_config,
+    json_dumps,
+    embed_timestamp,
     mock_player_status  # Fallback function
 )
 
@@ -62,50 +74,123 @@ API_ENDPOINTS = [
 # Default language
 DEFAULT_LANG = "en"
 
+# Languages accepted by !lang
+SUPPORTED_LANGS = frozenset({'en', 'fr'})
+
 # Config file path
 CONFIG_FILE = "bot_config.json"
 
 # Use mock data if API fails (for testing)
 USE_MOCK_IF_API_FAILS = True
 
+# Optional hosted GIF URLs; when set, embeds link them instead of uploading
+GIF_URLS = {
+    "banned.gif": os.environ.get("BANNED_GIF_URL"),
+    "notbanned.gif": os.environ.get("NOT_BANNED_GIF_URL"),
+}
+
+# Max number of remembered user language preferences (oldest dropped first)
+MAX_USER_LANGUAGES = 100_000
+
+# Seconds a health check result is reused by !apistatus
+HEALTH_CHECK_TTL = 30.0
+
+# Seconds to wait for more channel restriction changes before writing config
+SAVE_DEBOUNCE = 2.0
+
+# How long (seconds) a ban lookup result is reused for repeat !ID requests.
+# Bans are effectively permanent, so banned results are kept longer.
+BAN_CACHE_TTL = 300.0
+BANNED_CACHE_TTL = 3600.0
+
+# Max number of player IDs kept in the ban lookup cache
+BAN_CACHE_MAX = 10_000
+
+# Per-request timeout (seconds) and attempts for ban lookups
+API_TIMEOUT = 5.0
+API_ATTEMPTS = 2
+
+# Seconds a !ping latency reading is reused
+PING_CACHE_TTL = 1.0
+
+# GIFs above this size are streamed from disk per send instead of kept in
+# memory. Set above the shipped assets (banned.gif is ~3.7 MB) and below
+# Discord's upload limit, so streaming only kicks in for swapped-in files.
+GIF_MAX_CACHE_BYTES = 8 * 1024 * 1024
+
 # ============================================================================
-# Flask web server for keep-alive
+# Logging
 # ============================================================================
 
-web_app = Flask(__name__)
+logger = logging.getLogger("banbot")
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Route log records through a queue so stdout writes happen on a
+    background thread instead of blocking the event loop
+    """
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
 
-@web_app.route('/')
-def home():
+# ============================================================================
+# Web server for keep-alive
+# ============================================================================
+
+# Everything in the / response except the timestamp, serialized once
+_HOME_PREFIX = json_dumps({
+    "status": "online",
+    "service": "FreeFire Ban Checker",
+    "developer": "Digamber Raj",
+    "api_status": "operational"
+})[:-1] + b',"timestamp":"'
+_HOME_SUFFIX = b'"}'
+
+# [unix_second, body] - the response only changes once a second
+_home_cache = [0, b""]
+
+async def home(request: web.Request) -> web.Response:
     """Health check endpoint for monitoring"""
-    return jsonify({
-        "status": "online",
-        "service": "FreeFire Ban Checker",
-        "developer": "Digamber Raj",
-        "timestamp": datetime.utcnow().isoformat(),
-        "api_status": "operational"
-    })
+    now = int(time.time())
+    if now != _home_cache[0]:
+        _home_cache[0] = now
+        timestamp = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None).isoformat().encode()
+        _home_cache[1] = _HOME_PREFIX + timestamp + _HOME_SUFFIX
+    
+    return web.Response(body=_home_cache[1], content_type='application/json')
 
-@web_app.route('/health')
-def health_check():
+async def health_check(request: web.Request) -> web.Response:
     """Simple health endpoint for uptime monitoring"""
-    return "OK", 200
+    return web.Response(text="OK")
 
-@web_app.route('/api-test')
-def api_test():
+async def api_test(request: web.Request) -> web.Response:
     """Test API connectivity"""
-    return jsonify({
+    return web.Response(body=json_dumps({
         "message": "API Test Endpoint",
         "endpoints": API_ENDPOINTS,
         "status": "testing_required"
-    })
+    }), content_type='application/json')
 
-def run_flask():
-    """Run Flask in a separate thread"""
-    try:
-        port = int(os.environ.get("PORT", 8080))
-        web_app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False, threaded=True)
-    except Exception as e:
-        print(f"Flask error: {e}")
+async def start_web_server() -> web.AppRunner:
+    """Serve the keep-alive endpoints on the bot's event loop"""
+    web_app = web.Application()
+    web_app.router.add_get('/', home)
+    web_app.router.add_get('/health', health_check)
+    web_app.router.add_get('/api-test', api_test)
+    
+    runner = web.AppRunner(web_app)
+    await runner.setup()
+    port = int(os.environ.get("PORT", 8080))
+    await web.TCPSite(runner, '0.0.0.0', port).start()
+    return runner
 
 # ============================================================================
 # Discord Bot Setup
@@ -123,87 +208,510 @@ bot = commands.Bot(
     help_command=None
 )
 
-# Store user language preferences
-user_languages: Dict[int, str] = {}
+# Store user language preferences (bounded, see remember_language)
+user_languages: "OrderedDict[int, str]" = OrderedDict()
 
 # Store channel restrictions
 allowed_channels: Dict[int, int] = {}
 
+# Whether bot_config.json has been read yet
+config_loaded = False
+
+# Channel restrictions as last written to disk (skip no-op saves)
+_last_saved: Dict[int, int] = {}
+
+# Serializes config writes (created lazily inside the running loop)
+_save_lock: Optional[asyncio.Lock] = None
+
+# Debounced config writer (see save_allowed_channels)
+_save_pending: Optional[asyncio.Event] = None
+_saver_task: Optional[asyncio.Task] = None
+
+class ApiStatus:
+    """Current state of the ban check API"""
+    __slots__ = ("working", "last_checked", "active_endpoint")
+    
+    def __init__(self):
+        self.working: bool = False
+        self.last_checked: Optional[str] = None
+        self.active_endpoint: Optional[str] = None
+
 # Store API status
-api_status = {
-    "working": False,
-    "last_checked": None,
-    "active_endpoint": None
-}
+api_status = ApiStatus()
+
+# Recent/pending ban lookups: player_id -> (expires_at, future)
+_ban_cache: Dict[str, Tuple[float, asyncio.Future]] = {}
+
+# Last successful result per player, served (marked stale) when the API fails
+_last_good: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Ban status GIFs, read from disk once (see _preload_gifs)
+GIF_CACHE: Dict[str, Optional[bytes]] = {}
+
+# Oversized GIFs that are uploaded straight from disk: filename -> path
+GIF_PATHS: Dict[str, str] = {}
 
 # Load translations once
 translations = load_translations()
 
+def _flatten(tr: Mapping[str, Any]) -> Dict[str, str]:
+    """Flatten one language's translations to dotted keys ('errors.missing_id')"""
+    flat = {}
+    for cat, value in tr.items():
+        if isinstance(value, str):
+            flat[cat] = value
+        else:
+            for key, text in value.items():
+                flat[f"{cat}.{key}"] = text
+    return flat
+
+# Per-language flat lookup: T['en']['errors.missing_id']
+T: Dict[str, Dict[str, str]] = {lang: _flatten(tr) for lang, tr in translations.items()}
+
+# Complete reply strings (emoji prefix included) for the common responses
+REPLIES: Dict[str, Dict[str, str]] = {
+    lang: {
+        'missing_id': f"❌ {msgs['errors.missing_id']}",
+        'invalid_id': f"⚠️ {msgs['errors.invalid_id']}",
+        'api_error': f"🔧 {msgs['errors.api_error']}",
+        'unexpected': f"💥 {msgs['errors.unexpected']}",
+        'language_set': f"✅ {msgs['language_set']}",
+    }
+    for lang, msgs in T.items()
+}
+
+def remember_language(user_id: int, lang: str):
+    """Store a user's language, evicting the oldest entries past the cap"""
+    user_languages[user_id] = lang
+    user_languages.move_to_end(user_id)
+    while len(user_languages) > MAX_USER_LANGUAGES:
+        user_languages.popitem(last=False)
+
+def _lang_for(user_id: int) -> str:
+    """Get a user's language code, falling back to the default"""
+    return user_languages.get(user_id, DEFAULT_LANG)
+
+# ============================================================================
+# Prebuilt Embeds
+# ============================================================================
+
+# Static embeds are built once here as to_dict() templates. Handlers build
+# each reply with _embed_from() and fill in the timestamp (and any live
+# status). Embed.copy() is shallow and would share the template's field
+# list, so set_field_at() on a copy would edit the template itself.
+
+def _embed_from(template: Dict[str, Any]) -> discord.Embed:
+    """Build a fresh embed from a to_dict() template"""
+    return discord.Embed.from_dict(copy.deepcopy(template))
+
+_WELCOME_DESCRIPTION = (
+    "Thanks for adding me! I check if Free Fire IDs are banned.\n\n"
+    "**Main Commands:**\n"
+    "`!ID <player_id>` - Check ban status\n"
+    "`!lang en/fr` - Set your language\n"
+    "`!guilds` - Show server count\n"
+    "`!botinfo` - Show all commands\n"
+    "`!apistatus` - Check API status\n\n"
+)
+
+_WELCOME_TMPL: Dict[str, Any] = (
+    discord.Embed(title="🤖 Free Fire Ban Checker")
+    .set_footer(text="Developer: Digamber Raj")
+    .to_dict()
+)
+
+_BOTINFO_TMPL: Dict[str, Any] = (
+    discord.Embed(
+        title="🤖 Free Fire Ban Checker Bot",
+        description=(
+            "A Discord bot to check Free Fire player ban status\n\n"
+            "**Main Commands:**\n"
+            "• `!ID <player_id>` - Check if player is banned\n"
+            "• `!lang en/fr` - Set your language\n"
+            "• `!guilds` - Show server count\n"
+            "• `!apistatus` - Check API status\n"
+            "• `!botinfo` - Show this info\n"
+            "• `!ping` - Check bot latency\n\n"
+            "**Admin Commands:**\n"
+            "• `!setchannel` - Restrict bot to current channel\n"
+            "• `!removechannel` - Remove channel restriction\n"
+            "• `!helpchannel` - Show current restriction\n"
+        ),
+        color=0x5865F2
+    )
+    .add_field(name="Developer", value="Digamber Raj", inline=True)
+    .add_field(name="Prefix", value="`!`", inline=True)
+    .add_field(name="API Status", value="", inline=True)
+    .set_footer(text="Free Fire Ban Checker Bot")
+    .to_dict()
+)
+
+_NO_RESTRICTION_TMPL: Dict[str, Any] = (
+    discord.Embed(
+        title="ℹ️ Channel Restriction Info",
+        description=(
+            "No channel restriction is set for this server.\n"
+            "Bot commands work in all channels.\n\n"
+            "To restrict to a specific channel, use `!setchannel` (Admin only)."
+        ),
+        color=0x5865F2
+    )
+    .set_footer(text="Developer: Digamber Raj")
+    .to_dict()
+)
+
+_CHANNEL_SET_TMPL: Dict[str, Any] = (
+    discord.Embed(title="✅ Channel Restriction Set", color=0x00FF00)
+    .set_footer(text="Developer: Digamber Raj")
+    .to_dict()
+)
+
+_CHANNEL_REMOVED_TMPL: Dict[str, Any] = (
+    discord.Embed(
+        title="✅ Channel Restriction Removed",
+        description=(
+            "Channel restriction has been removed.\n"
+            "Bot commands will now work in all channels."
+        ),
+        color=0x00FF00
+    )
+    .set_footer(text="Developer: Digamber Raj")
+    .to_dict()
+)
+
+_PING_TMPL: Dict[str, Any] = (
+    discord.Embed(title="🏓 Pong!", color=0x5865F2)
+    .add_field(name="API Status", value="", inline=True)
+    .to_dict()
+)
+
+def _build_guilds_tmpl(msgs: Dict[str, str]) -> Dict[str, Any]:
+    """Build the !guilds embed template for one language; the count is filled in per call"""
+    return (
+        discord.Embed(title=msgs['guilds.title'], color=0x5865F2)
+        .add_field(name="API Status", value="", inline=True)
+        .set_footer(text="Developer: Digamber Raj")
+        .to_dict()
+    )
+
+_GUILDS_TMPL: Dict[str, Dict[str, Any]] = {lang: _build_guilds_tmpl(msgs) for lang, msgs in T.items()}
+
+# !guilds description split around its {count} placeholder: lang -> (prefix, suffix)
+_GUILDS_DESC: Dict[str, Tuple[str, str]] = {
+    lang: tuple(msgs['guilds.description'].split('{count}', 1)) for lang, msgs in T.items()
+}
+
+@functools.lru_cache(maxsize=32)
+def _guilds_description(lang: str, count: int) -> str:
+    """Render the !guilds description; the count only changes on join/leave"""
+    prefix, suffix = _GUILDS_DESC[lang]
+    return f"{prefix}{count}{suffix}"
+
 # ============================================================================
 # Configuration Management
 # ============================================================================
 
-def load_allowed_channels():
-    """Load allowed channels from config file"""
-    global allowed_channels
+async def load_allowed_channels():
+    """Load allowed channels from config file (read in a worker thread)"""
+    global allowed_channels, _last_saved
     try:
-        config = load_bot_config()
+        loop = asyncio.get_running_loop()
+        config = await loop.run_in_executor(None, load_bot_config)
         if 'allowed_channels' in config:
-            allowed_channels = config['allowed_channels']
-            print(f"📁 Loaded {len(allowed_channels)} channel restrictions from config")
+            # JSON object keys are always strings, but lookups use int guild IDs
+            allowed_channels = {
+                int(guild_id): int(channel_id)
+                for guild_id, channel_id in config['allowed_channels'].items()
+            }
+            _last_saved = dict(allowed_channels)
+            logger.info(f"📁 Loaded {len(allowed_channels)} channel restrictions from config")
     except Exception as e:
-        print(f"⚠️ Error loading config: {e}")
+        logger.warning(f"⚠️ Error loading config: {e}")
         allowed_channels = {}
 
 def save_allowed_channels():
-    """Save allowed channels to config file"""
+    """Schedule a config write; bursts of changes are coalesced into one"""
+    global _save_pending, _saver_task
+    if _save_pending is None:
+        _save_pending = asyncio.Event()
+    if _saver_task is None or _saver_task.done():
+        _saver_task = asyncio.create_task(_config_saver())
+    _save_pending.set()
+
+async def _config_saver():
+    """Background task that writes the config at most once per SAVE_DEBOUNCE"""
+    while True:
+        await _save_pending.wait()
+        await asyncio.sleep(SAVE_DEBOUNCE)
+        _save_pending.clear()
+        # Shielded so shutdown can't cancel a write halfway through
+        await asyncio.shield(flush_allowed_channels())
+
+async def flush_allowed_channels():
+    """Save allowed channels to config file now (only if they changed)"""
+    global _last_saved, _save_lock
+    if _save_lock is None:
+        _save_lock = asyncio.Lock()
+    
+    async with _save_lock:
+        if allowed_channels == _last_saved:
+            return
+        
+        try:
+            snapshot = dict(allowed_channels)
+            config = {
+                'allowed_channels': snapshot,
+                'updated_at': datetime.now(timezone.utc).isoformat(),
+                'developer': 'Digamber Raj'
+            }
+            if await save_bot_config_async(config):
+                _last_saved = snapshot
+                logger.info(f"💾 Saved {len(snapshot)} channel restrictions")
+        except Exception as e:
+            logger.warning(f"⚠️ Error saving config: {e}")
+
+# ============================================================================
+# Asset Loading
+# ============================================================================
+
+def _read_gif(path: str) -> Tuple[Optional[bytes], bool]:
+    """
+    Read one GIF from disk
+    
+    Returns (data, stream): data is None if the file is missing, unreadable
+    or larger than GIF_MAX_CACHE_BYTES; stream is True in the last case.
+    """
     try:
-        config = {
-            'allowed_channels': allowed_channels,
-            'updated_at': datetime.utcnow().isoformat(),
-            'developer': 'Digamber Raj'
-        }
-        save_bot_config(config)
-        print(f"💾 Saved {len(allowed_channels)} channel restrictions")
+        if os.path.exists(path):
+            if os.path.getsize(path) > GIF_MAX_CACHE_BYTES:
+                return None, True
+            with open(path, 'rb') as f:
+                return f.read(), False
     except Exception as e:
-        print(f"⚠️ Error saving config: {e}")
+        logger.warning(f"⚠️ Error loading {path}: {e}")
+    return None, False
+
+async def _preload_gifs():
+    """Read the ban status GIFs into memory so !ID doesn't touch the disk"""
+    # on_ready fires again after reconnects; the assets don't change
+    if GIF_CACHE:
+        return
+    
+    # Read in the default executor so a slow disk can't stall the gateway
+    loop = asyncio.get_running_loop()
+    for name in ("banned.gif", "notbanned.gif"):
+        path = f"assets/{name}"
+        GIF_CACHE[name], stream = await loop.run_in_executor(None, _read_gif, path)
+        if stream:
+            GIF_PATHS[name] = path
+    logger.info(f"🖼️ Loaded {sum(1 for data in GIF_CACHE.values() if data)} GIF assets")
+    if GIF_PATHS:
+        logger.info(f"🖼️ Streaming {len(GIF_PATHS)} large GIF assets from disk")
 
 # ============================================================================
 # API Health Check
 # ============================================================================
 
+# Monotonic time of the last finished health check, and the running one
+_last_health_check = 0.0
+_health_task: Optional[asyncio.Task] = None
+
 async def check_api_health():
     """Check if API endpoints are working"""
-    global api_status
-    
+    global _last_health_check
+    try:
+        return await _probe_api_endpoints()
+    finally:
+        _last_health_check = time.monotonic()
+
+async def _first_success(calls: Dict[str, Awaitable[Any]]) -> Optional[Tuple[str, Any]]:
+    """
+    Run the calls concurrently and return (key, result) of the first truthy
+    result, cancelling the rest. Returns None if every call fails.
+    """
+    tasks = {asyncio.ensure_future(call): key for key, call in calls.items()}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None and task.result():
+                    return tasks[task], task.result()
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def _probe_endpoint(session: aiohttp.ClientSession, endpoint: str) -> bool:
+    """Check whether a single endpoint answers"""
     test_id = "1234567890"  # Test ID
+    try:
+        logger.info(f"🔍 Testing API endpoint: {endpoint}")
+        async with session.get(f"{endpoint}{test_id}", timeout=5) as response:
+            return response.status == 200
+    except Exception as e:
+        logger.warning(f"❌ API endpoint failed {endpoint}: {e}")
+        return False
+
+async def _probe_api_endpoints():
+    """Probe all endpoints at once and record the first working one"""
+    session = await get_session()
+    winner = await _first_success({
+        endpoint: _probe_endpoint(session, endpoint) for endpoint in API_ENDPOINTS
+    })
     
-    for endpoint in API_ENDPOINTS:
-        try:
-            print(f"🔍 Testing API endpoint: {endpoint}")
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{endpoint}{test_id}", timeout=5) as response:
-                    if response.status == 200:
-                        api_status = {
-                            "working": True,
-                            "last_checked": datetime.utcnow().isoformat(),
-                            "active_endpoint": endpoint
-                        }
-                        print(f"✅ API is working: {endpoint}")
-                        return True
-        except Exception as e:
-            print(f"❌ API endpoint failed {endpoint}: {e}")
-            continue
+    api_status.last_checked = datetime.now(timezone.utc).isoformat()
+    if winner:
+        endpoint = winner[0]
+        api_status.working = True
+        api_status.active_endpoint = endpoint
+        logger.info(f"✅ API is working: {endpoint}")
+        return True
     
     # All endpoints failed
-    api_status = {
-        "working": False,
-        "last_checked": datetime.utcnow().isoformat(),
-        "active_endpoint": None
-    }
-    print("❌ All API endpoints failed, will use mock data")
+    api_status.working = False
+    api_status.active_endpoint = None
+    logger.warning("❌ All API endpoints failed, will use mock data")
     return False
 
+async def refresh_api_health() -> bool:
+    """
+    Get API health, probing at most once per HEALTH_CHECK_TTL
+    
+    Concurrent callers share a single in-flight probe.
+    """
+    global _health_task
+    if time.monotonic() - _last_health_check < HEALTH_CHECK_TTL:
+        return api_status.working
+    
+    if _health_task is None or _health_task.done():
+        _health_task = asyncio.create_task(check_api_health())
+    return await asyncio.shield(_health_task)
+
+# ============================================================================
+# Ban Status Lookup
+# ============================================================================
+
+async def _fetch_with_retry(player_id: str, endpoint: str,
+                            session: aiohttp.ClientSession) -> Optional[Dict[str, Any]]:
+    """Query one endpoint with a hard timeout, retrying with a short backoff"""
+    for attempt in range(API_ATTEMPTS):
+        try:
+            return await asyncio.wait_for(
+                get_player_status(player_id, endpoint, session),
+                timeout=API_TIMEOUT
+            )
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            logger.warning(f"⚠️ Lookup attempt {attempt + 1} failed for ID {player_id}: {type(e).__name__}")
+            if attempt + 1 < API_ATTEMPTS:
+                await asyncio.sleep(0.2 * (attempt + 1))
+    return None
+
+async def _fetch_player_status(player_id: str) -> Optional[Dict[str, Any]]:
+    """Query the known-good endpoint, falling back to the others"""
+    active = api_status.active_endpoint
+    if not (api_status.working and active):
+        return None
+    
+    session = await get_session()
+    status_data = await _fetch_with_retry(player_id, active, session)
+    if status_data:
+        return status_data
+    
+    # Race the remaining endpoints and keep whichever answers first
+    winner = await _first_success({
+        endpoint: _fetch_with_retry(player_id, endpoint, session)
+        for endpoint in API_ENDPOINTS if endpoint != active
+    })
+    if winner:
+        api_status.active_endpoint, status_data = winner
+        return status_data
+    return None
+
+def _evict_ban_cache():
+    """Drop expired lookups, then the oldest ones if still over BAN_CACHE_MAX"""
+    now = time.monotonic()
+    for player_id, (expires_at, fut) in list(_ban_cache.items()):
+        if fut.done() and now >= expires_at:
+            del _ban_cache[player_id]
+    
+    # Dict order is insertion order, so the front holds the oldest results
+    for player_id, (expires_at, fut) in list(_ban_cache.items()):
+        if len(_ban_cache) <= BAN_CACHE_MAX:
+            break
+        if fut.done():
+            del _ban_cache[player_id]
+
+def cached_player_status(player_id: str) -> Optional[Dict[str, Any]]:
+    """Return a fresh, completed lookup from the cache without waiting"""
+    entry = _ban_cache.get(player_id)
+    if entry:
+        expires_at, fut = entry
+        if fut.done() and not fut.cancelled() and time.monotonic() < expires_at:
+            return fut.result()
+    return None
+
+def stale_player_status(player_id: str) -> Optional[Dict[str, Any]]:
+    """Return the last successful result for a player, marked stale"""
+    last = _last_good.get(player_id)
+    if last:
+        return {**last, 'stale': True}
+    return None
+
+async def lookup_player_status(player_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get ban status for a player ID, sharing recent and in-flight lookups
+    
+    Concurrent or repeated requests for the same ID await the same result
+    instead of each hitting the API. Results are kept for BAN_CACHE_TTL,
+    or BANNED_CACHE_TTL for banned accounts. If the API fails, the last
+    successful result for the ID (if any) is returned marked stale.
+    """
+    now = time.monotonic()
+    entry = _ban_cache.get(player_id)
+    if entry:
+        expires_at, fut = entry
+        if now < expires_at:
+            return await asyncio.shield(fut)
+        # Expired, drop it and fetch again
+        del _ban_cache[player_id]
+    
+    fut = asyncio.get_running_loop().create_future()
+    _ban_cache[player_id] = (now + BAN_CACHE_TTL, fut)
+    try:
+        status_data = await _fetch_player_status(player_id)
+    except Exception as e:
+        # Waiters get the same error as this caller. Read it back once so
+        # asyncio doesn't warn when nobody else was waiting.
+        _ban_cache.pop(player_id, None)
+        fut.set_exception(e)
+        fut.exception()
+        raise
+    except BaseException:
+        _ban_cache.pop(player_id, None)
+        fut.cancel()
+        raise
+    
+    if status_data:
+        # Start the TTL from when the result arrived (and move it to the back)
+        ttl = BANNED_CACHE_TTL if status_data.get('banned') else BAN_CACHE_TTL
+        _ban_cache.pop(player_id, None)
+        _ban_cache[player_id] = (time.monotonic() + ttl, fut)
+        if len(_ban_cache) > BAN_CACHE_MAX:
+            _evict_ban_cache()
+        
+        # Keep it as the fallback for later API outages
+        _last_good[player_id] = status_data
+        _last_good.move_to_end(player_id)
+        if len(_last_good) > BAN_CACHE_MAX:
+            _last_good.popitem(last=False)
+    else:
+        # Don't keep failed lookups around; fall back to the last good result
+        _ban_cache.pop(player_id, None)
+        status_data = stale_player_status(player_id)
+    fut.set_result(status_data)
+    return status_data
+
 # ============================================================================
 # Channel Restriction Check
 # ============================================================================
@@ -211,29 +719,20 @@ async def check_api_health():
 def check_channel_restriction():
     """Decorator to check if command is allowed in current channel"""
     async def predicate(ctx):
-        # Always allow commands in DMs
-        if isinstance(ctx.channel, discord.DMChannel):
-            return True
-        
-        # If no guild (shouldn't happen)
-        if not ctx.guild:
+        # DMs have no guild and are always allowed
+        guild = ctx.guild
+        if guild is None:
             return True
         
-        guild_id = ctx.guild.id
-        
-        # If no restriction set for this guild, allow everywhere
-        if guild_id not in allowed_channels:
-            return True
-        
-        # Check if current channel is the allowed one
-        if ctx.channel.id == allowed_channels[guild_id]:
+        # Allowed if this guild has no restriction or we're in its channel
+        channel_id = allowed_channels.get(guild.id)
+        if channel_id is None or channel_id == ctx.channel.id:
             return True
         
         # If not, send error message
-        allowed_channel = ctx.guild.get_channel(allowed_channels[guild_id])
-        if allowed_channel:
+        if guild.get_channel(channel_id):
             await ctx.send(
-                f"⚠️ This bot is restricted to <#{allowed_channels[guild_id]}> only. "
+                f"⚠️ This bot is restricted to <#{channel_id}> only. "
                 f"Please use commands there."
             )
         else:
@@ -252,19 +751,26 @@ def check_channel_restriction():
 @bot.event
 async def on_ready():
     """Called when the bot is ready and connected"""
-    print(f"✅ Bot is online as {bot.user.name}")
-    print(f"✅ Connected to {len(bot.guilds)} servers")
-    print(f"✅ Developer: Digamber Raj")
-    print(f"✅ Prefix: {COMMAND_PREFIX}")
+    global config_loaded
+    logger.info(f"✅ Bot is online as {bot.user.name}")
+    logger.info(f"✅ Connected to {len(bot.guilds)} servers")
+    logger.info(f"✅ Developer: Digamber Raj")
+    logger.info(f"✅ Prefix: {COMMAND_PREFIX}")
+    
+    # Load saved configuration (only on the first connect, so a reconnect
+    # can't overwrite restriction changes that haven't been written yet)
+    if not config_loaded:
+        await load_allowed_channels()
+        config_loaded = True
     
-    # Load saved configuration
-    load_allowed_channels()
+    # Cache GIF assets
+    await _preload_gifs()
     
     # Check API health
     await check_api_health()
     
     # Set bot status based on API status
-    if api_status["working"]:
+    if api_status.working:
         activity = discord.Activity(
             type=discord.ActivityType.watching,
             name="!ID <player_id>"
@@ -283,65 +789,77 @@ async def on_ready():
 @bot.event
 async def on_guild_join(guild):
     """When bot joins a new server"""
-    print(f"➕ Joined new server: {guild.name} (ID: {guild.id})")
+    logger.info(f"➕ Joined new server: {guild.name} (ID: {guild.id})")
     
     # Send welcome message
     try:
+        # Prefer the system channel, else the first text channel we can write to
+        me = guild.me
         channel = guild.system_channel
-        if not channel or not channel.permissions_for(guild.me).send_messages:
-            for ch in guild.text_channels:
-                if ch.permissions_for(guild.me).send_messages:
-                    channel = ch
-                    break
+        if not channel or not channel.permissions_for(me).send_messages:
+            channel = next(
+                (ch for ch in guild.text_channels if ch.permissions_for(me).send_messages),
+                None
+            )
         
-        if channel and channel.permissions_for(guild.me).send_messages:
-            welcome_embed = discord.Embed(
-                title="🤖 Free Fire Ban Checker",
-                description=(
-                    "Thanks for adding me! I check if Free Fire IDs are banned.\n\n"
-                    "**Main Commands:**\n"
-                    "`!ID <player_id>` - Check ban status\n"
-                    "`!lang en/fr` - Set your language\n"
-                    "`!guilds` - Show server count\n"
-                    "`!botinfo` - Show all commands\n"
-                    "`!apistatus` - Check API status\n\n"
-                    f"**Current Status:** {'✅ API Working' if api_status['working'] else '⚠️ Demo Mode'}"
-                ),
-                color=0x5865F2 if api_status["working"] else 0xFFA500,
-                timestamp=datetime.utcnow()
+        if channel:
+            welcome_embed = _embed_from(_WELCOME_TMPL)
+            welcome_embed.description = (
+                _WELCOME_DESCRIPTION +
+                f"**Current Status:** {'✅ API Working' if api_status.working else '⚠️ Demo Mode'}"
             )
-            welcome_embed.set_footer(text="Developer: Digamber Raj")
+            welcome_embed.colour = 0x5865F2 if api_status.working else 0xFFA500
+            welcome_embed.timestamp = embed_timestamp()
             await channel.send(embed=welcome_embed)
     except Exception as e:
-        print(f"⚠️ Couldn't send welcome message: {e}")
+        logger.warning(f"⚠️ Couldn't send welcome message: {e}")
 
 @bot.event
 async def on_guild_remove(guild):
     """When bot is removed from a server"""
-    print(f"➖ Removed from server: {guild.name} (ID: {guild.id})")
+    logger.info(f"➖ Removed from server: {guild.name} (ID: {guild.id})")
     
     # Clean up channel restriction for this guild
     if guild.id in allowed_channels:
         del allowed_channels[guild.id]
         save_allowed_channels()
 
+async def _on_command_not_found(ctx, error):
+    return
+
+async def _on_missing_argument(ctx, error):
+    await ctx.send(REPLIES[_lang_for(ctx.author.id)]['missing_id'])
+
+async def _on_check_failure(ctx, error):
+    if "predicate" in str(error):
+        return
+    await ctx.send("❌ You need **Administrator** permissions to use this command.")
+
+async def _on_bot_missing_permissions(ctx, error):
+    await ctx.send("❌ I don't have permission to do that. Please check my role permissions.")
+
+# Error type -> handler (subclasses resolve through the MRO)
+_ERR_HANDLERS: Dict[type, Callable[..., Awaitable[None]]] = {
+    commands.CommandNotFound: _on_command_not_found,
+    commands.MissingRequiredArgument: _on_missing_argument,
+    commands.CheckFailure: _on_check_failure,
+    commands.BotMissingPermissions: _on_bot_missing_permissions,
+}
+
 @bot.event
 async def on_command_error(ctx, error):
     """Handle command errors gracefully"""
-    if isinstance(error, commands.CommandNotFound):
-        return
-    elif isinstance(error, commands.MissingRequiredArgument):
-        lang = user_languages.get(ctx.author.id, DEFAULT_LANG)
-        msg = translations[lang]['errors']['missing_id']
-        await ctx.send(f"❌ {msg}")
-    elif isinstance(error, commands.CheckFailure):
-        if "predicate" in str(error):
-            return
-        await ctx.send("❌ You need **Administrator** permissions to use this command.")
-    elif isinstance(error, commands.BotMissingPermissions):
-        await ctx.send("❌ I don't have permission to do that. Please check my role permissions.")
+    handler = _ERR_HANDLERS.get(type(error))
+    if handler is None:
+        handler = next(
+            (_ERR_HANDLERS[cls] for cls in type(error).__mro__ if cls in _ERR_HANDLERS),
+            None
+        )
+    
+    if handler:
+        await handler(ctx, error)
     else:
-        print(f"⚠️ Command error: {type(error).__name__}: {error}")
+        logger.error(f"⚠️ Command error: {type(error).__name__}: {error}")
 
 # ============================================================================
 # Bot Commands
@@ -355,68 +873,75 @@ async def check_ban(ctx, player_id: str):
     Usage: !ID <player_id>
     """
     # Get user's language preference
-    user_id = ctx.author.id
-    lang = user_languages.get(user_id, DEFAULT_LANG)
+    lang = _lang_for(ctx.author.id)
     
     # Validate player ID
     if not validate_player_id(player_id):
-        error_msg = translations[lang]['errors']['invalid_id']
-        await ctx.send(f"⚠️ {error_msg}")
+        await ctx.send(REPLIES[lang]['invalid_id'])
         return
     
-    # Show typing indicator
-    async with ctx.typing():
-        try:
-            status_data = None
-            
-            # Try to get real data from API
-            if api_status["working"] and api_status["active_endpoint"]:
-                for endpoint in API_ENDPOINTS:
-                    status_data = await get_player_status(player_id, endpoint)
-                    if status_data:
-                        break
-            
-            # If API failed and mock is enabled, use mock data
-            if not status_data and USE_MOCK_IF_API_FAILS:
-                print(f"⚠️ Using mock data for ID: {player_id}")
-                status_data = mock_player_status(player_id)
-                
-                # Add note about demo mode
-                if 'name' in status_data:
-                    status_data['name'] = f"{status_data['name']} [DEMO]"
-            
-            if not status_data:
-                error_msg = translations[lang]['errors']['api_error']
-                await ctx.send(f"🔧 {error_msg}")
-                return
-            
-            # Create embed response
-            embed = build_embed_response(status_data, lang, translations)
-            
-            # Add API status note if in demo mode
-            if not api_status["working"] and USE_MOCK_IF_API_FAILS:
-                embed.add_field(
-                    name="⚠️ Note",
-                    value="Currently in **Demo Mode** (API offline). Real ban status may vary.",
-                    inline=False
-                )
+    try:
+        # Cached results answer immediately; only show the typing
+        # indicator while actually waiting on the API
+        status_data = cached_player_status(player_id)
+        if status_data is None:
+            if api_status.working:
+                async with ctx.typing():
+                    status_data = await lookup_player_status(player_id)
+            else:
+                status_data = stale_player_status(player_id)
+        
+        # If API failed and mock is enabled, use mock data
+        if not status_data and USE_MOCK_IF_API_FAILS:
+            logger.info(f"⚠️ Using mock data for ID: {player_id}")
+            status_data = mock_player_status(player_id)
             
-            # Determine which GIF to send
-            is_banned = status_data.get('banned', False)
-            gif_filename = "banned.gif" if is_banned else "notbanned.gif"
-            gif_path = f"assets/{gif_filename}"
+            # Add note about demo mode
+            if 'name' in status_data:
+                status_data['name'] = f"{status_data['name']} [DEMO]"
+        
+        if not status_data:
+            await ctx.send(REPLIES[lang]['api_error'])
+            return
+        
+        # Create embed response
+        embed = build_embed_response(status_data, lang)
+        
+        # Add API status note if showing demo data
+        if status_data.get('mock'):
+            embed.add_field(
+                name="⚠️ Note",
+                value="Currently in **Demo Mode** (API offline). Real ban status may vary.",
+                inline=False
+            )
+        
+        # Determine which GIF to send
+        is_banned = status_data.get('banned', False)
+        gif_filename = "banned.gif" if is_banned else "notbanned.gif"
+        gif_url = GIF_URLS.get(gif_filename)
+        gif_data = GIF_CACHE.get(gif_filename)
+        gif_path = GIF_PATHS.get(gif_filename)
+        
+        # Prefer a hosted URL (no upload), else attach the cached GIF
+        if gif_url:
+            embed.set_image(url=gif_url)
+            await ctx.send(embed=embed)
+        elif gif_data:
+            gif_file = discord.File(io.BytesIO(gif_data), filename=gif_filename)
+            await ctx.send(file=gif_file, embed=embed)
+        elif gif_path:
+            # Open in the executor; aiohttp then reads the upload in chunks there too
+            fp = await asyncio.get_running_loop().run_in_executor(None, open, gif_path, 'rb')
+            try:
+                await ctx.send(file=discord.File(fp, filename=gif_filename), embed=embed)
+            finally:
+                fp.close()
+        else:
+            await ctx.send(embed=embed)
             
-            # Check if GIF file exists
-            if os.path.exists(gif_path):
-                gif_file = discord.File(gif_path, filename=gif_filename)
-                await ctx.send(file=gif_file, embed=embed)
-            else:
-                await ctx.send(embed=embed)
-                
-        except Exception as e:
-            print(f"Error checking ban status: {e}")
-            error_msg = translations[lang]['errors']['unexpected']
-            await ctx.send(f"💥 {error_msg}")
+    except Exception as e:
+        logger.error(f"Error checking ban status: {e}")
+        await ctx.send(REPLIES[lang]['unexpected'])
 
 @bot.command(name='lang')
 @check_channel_restriction()
@@ -426,23 +951,21 @@ async def set_language(ctx, language: str = None):
     Usage: !lang en  OR  !lang fr
     """
     if language is None:
-        current_lang = user_languages.get(ctx.author.id, DEFAULT_LANG)
-        await ctx.send(f"ℹ️ Your current language is: **{current_lang}**\n"
+        await ctx.send(f"ℹ️ Your current language is: **{_lang_for(ctx.author.id)}**\n"
                       f"Use `!lang en` or `!lang fr` to change.")
         return
     
     lang = language.lower().strip()
     
-    if lang not in ['en', 'fr']:
+    if lang not in SUPPORTED_LANGS:
         await ctx.send("⚠️ Available languages: `en` (English) or `fr` (French)")
         return
     
     # Store user preference
-    user_languages[ctx.author.id] = lang
+    remember_language(ctx.author.id, lang)
     
-    # Get confirmation message in selected language
-    confirmation = translations[lang]['language_set']
-    await ctx.send(f"✅ {confirmation}")
+    # Send confirmation in the selected language
+    await ctx.send(REPLIES[lang]['language_set'])
 
 @bot.command(name='guilds')
 @check_channel_restriction()
@@ -451,28 +974,21 @@ async def server_count(ctx):
     Display the number of servers this bot is in
     Usage: !guilds
     """
-    count = get_guild_count(bot)
+    count = len(bot.guilds)
     
     # Get user's language for response
-    user_id = ctx.author.id
-    lang = user_languages.get(user_id, DEFAULT_LANG)
-    
-    # Create response
-    embed = discord.Embed(
-        title=translations[lang]['guilds']['title'],
-        description=translations[lang]['guilds']['description'].format(count=count),
-        color=0x5865F2,
-        timestamp=datetime.utcnow()
-    )
+    lang = _lang_for(ctx.author.id)
     
-    embed.add_field(
+    # Create response from the prebuilt template
+    embed = _embed_from(_GUILDS_TMPL[lang])
+    embed.description = _guilds_description(lang, count)
+    embed.set_field_at(
+        0,
         name="API Status",
-        value="✅ Working" if api_status["working"] else "⚠️ Demo Mode",
+        value="✅ Working" if api_status.working else "⚠️ Demo Mode",
         inline=True
     )
     
-    embed.set_footer(text=f"Developer: Digamber Raj")
-    
     await ctx.send(embed=embed)
 
 @bot.command(name='apistatus')
@@ -481,32 +997,32 @@ async def api_status_command(ctx):
     Check the status of the ban check API
     Usage: !apistatus
     """
-    # Run API health check
-    is_working = await check_api_health()
+    # Run API health check (cached for HEALTH_CHECK_TTL)
+    is_working = await refresh_api_health()
     
     if is_working:
         embed = discord.Embed(
             title="✅ API Status: WORKING",
             description="The ban check API is currently operational.",
             color=0x00FF00,
-            timestamp=datetime.utcnow()
+            timestamp=embed_timestamp()
         )
         
         embed.add_field(
             name="Active Endpoint",
-            value=api_status["active_endpoint"] or "None",
+            value=api_status.active_endpoint or "None",
             inline=False
         )
         
         embed.add_field(
             name="Last Checked",
-            value=api_status["last_checked"] or "Never",
+            value=api_status.last_checked or "Never",
             inline=True
         )
         
         embed.add_field(
             name="Fallback Mode",
-            value="Disabled" if api_status["working"] else "Enabled",
+            value="Disabled" if api_status.working else "Enabled",
             inline=True
         )
     else:
@@ -514,7 +1030,7 @@ async def api_status_command(ctx):
             title="⚠️ API Status: OFFLINE",
             description="The ban check API is currently unavailable.",
             color=0xFF0000,
-            timestamp=datetime.utcnow()
+            timestamp=embed_timestamp()
         )
         
         embed.add_field(
@@ -549,18 +1065,12 @@ async def set_restricted_channel(ctx):
     save_allowed_channels()
     
     # Send confirmation
-    embed = discord.Embed(
-        title="✅ Channel Restriction Set",
-        description=(
-            f"Bot commands are now restricted to this channel only.\n"
-            f"**Channel:** <#{channel_id}>\n\n"
-            f"To remove restriction, use `!removechannel` (Admin only)."
-        ),
-        color=0x00FF00,
-        timestamp=datetime.utcnow()
+    embed = _embed_from(_CHANNEL_SET_TMPL)
+    embed.description = (
+        f"Bot commands are now restricted to this channel only.\n"
+        f"**Channel:** <#{channel_id}>\n\n"
+        f"To remove restriction, use `!removechannel` (Admin only)."
     )
-    
-    embed.set_footer(text="Developer: Digamber Raj")
     await ctx.send(embed=embed)
 
 @bot.command(name='removechannel')
@@ -576,18 +1086,7 @@ async def remove_channel_restriction(ctx):
         del allowed_channels[guild_id]
         save_allowed_channels()
         
-        embed = discord.Embed(
-            title="✅ Channel Restriction Removed",
-            description=(
-                "Channel restriction has been removed.\n"
-                "Bot commands will now work in all channels."
-            ),
-            color=0x00FF00,
-            timestamp=datetime.utcnow()
-        )
-        
-        embed.set_footer(text="Developer: Digamber Raj")
-        await ctx.send(embed=embed)
+        await ctx.send(embed=_embed_from(_CHANNEL_REMOVED_TMPL))
     else:
         await ctx.send("ℹ️ No channel restriction was set for this server.")
 
@@ -597,10 +1096,9 @@ async def show_channel_info(ctx):
     Show current channel restriction info
     Usage: !helpchannel
     """
-    guild_id = ctx.guild.id
+    channel_id = allowed_channels.get(ctx.guild.id)
     
-    if guild_id in allowed_channels:
-        channel_id = allowed_channels[guild_id]
+    if channel_id is not None:
         channel = ctx.guild.get_channel(channel_id)
         
         if channel:
@@ -612,8 +1110,7 @@ async def show_channel_info(ctx):
                     f"**Category:** {channel.category.name if channel.category else 'None'}\n\n"
                     f"Only administrators can change this setting using `!setchannel`."
                 ),
-                color=0xFFA500,
-                timestamp=datetime.utcnow()
+                color=0xFFA500
             )
         else:
             embed = discord.Embed(
@@ -623,20 +1120,10 @@ async def show_channel_info(ctx):
                     f"But this channel no longer exists in the server.\n\n"
                     f"Please use `!setchannel` in a new channel to update."
                 ),
-                color=0xFF0000,
-                timestamp=datetime.utcnow()
+                color=0xFF0000
             )
     else:
-        embed = discord.Embed(
-            title="ℹ️ Channel Restriction Info",
-            description=(
-                "No channel restriction is set for this server.\n"
-                "Bot commands work in all channels.\n\n"
-                "To restrict to a specific channel, use `!setchannel` (Admin only)."
-            ),
-            color=0x5865F2,
-            timestamp=datetime.utcnow()
-        )
+        embed = _embed_from(_NO_RESTRICTION_TMPL)
     
     embed.set_footer(text="Developer: Digamber Raj")
     await ctx.send(embed=embed)
@@ -647,64 +1134,34 @@ async def bot_information(ctx):
     Show bot information and commands
     Usage: !botinfo
     """
-    embed = discord.Embed(
-        title="🤖 Free Fire Ban Checker Bot",
-        description=(
-            "A Discord bot to check Free Fire player ban status\n\n"
-            "**Main Commands:**\n"
-            "• `!ID <player_id>` - Check if player is banned\n"
-            "• `!lang en/fr` - Set your language\n"
-            "• `!guilds` - Show server count\n"
-            "• `!apistatus` - Check API status\n"
-            "• `!botinfo` - Show this info\n"
-            "• `!ping` - Check bot latency\n\n"
-            "**Admin Commands:**\n"
-            "• `!setchannel` - Restrict bot to current channel\n"
-            "• `!removechannel` - Remove channel restriction\n"
-            "• `!helpchannel` - Show current restriction\n"
-        ),
-        color=0x5865F2,
-        timestamp=datetime.utcnow()
-    )
-    
-    embed.add_field(
-        name="Developer",
-        value="Digamber Raj",
-        inline=True
-    )
-    
-    embed.add_field(
-        name="Prefix",
-        value="`!`",
-        inline=True
-    )
-    
-    embed.add_field(
+    embed = _embed_from(_BOTINFO_TMPL)
+    embed.set_field_at(
+        2,
         name="API Status",
-        value="✅ Working" if api_status["working"] else "⚠️ Demo Mode",
+        value="✅ Working" if api_status.working else "⚠️ Demo Mode",
         inline=True
     )
-    
-    embed.set_footer(text="Free Fire Ban Checker Bot")
+    embed.timestamp = embed_timestamp()
     await ctx.send(embed=embed)
 
+# [monotonic_time, latency_ms] - heartbeat latency only updates every ~40s
+_last_ping = [0.0, 0]
+
 @bot.command(name='ping')
 async def ping_command(ctx):
     """Check bot latency"""
-    latency = round(bot.latency * 1000)  # Convert to ms
-    embed = discord.Embed(
-        title="🏓 Pong!",
-        description=f"Bot latency: **{latency}ms**",
-        color=0x5865F2,
-        timestamp=datetime.utcnow()
-    )
-    
-    embed.add_field(
+    now = time.monotonic()
+    if now - _last_ping[0] > PING_CACHE_TTL:
+        _last_ping[:] = [now, round(bot.latency * 1000)]  # Convert to ms
+    embed = _embed_from(_PING_TMPL)
+    embed.description = f"Bot latency: **{_last_ping[1]}ms**"
+    embed.set_field_at(
+        0,
         name="API Status",
-        value="✅ Working" if api_status["working"] else "⚠️ Demo Mode",
+        value="✅ Working" if api_status.working else "⚠️ Demo Mode",
         inline=True
     )
-    
+    embed.timestamp = embed_timestamp()
     await ctx.send(embed=embed)
 
 # ============================================================================
@@ -713,49 +1170,73 @@ async def ping_command(ctx):
 
 async def start_bot():
     """Start the Discord bot"""
-    print("🚀 Starting Free Fire Ban Checker Bot...")
-    print(f"👨‍💻 Developer: Digamber Raj")
-    print(f"🔧 Bot Token Present: Yes")
+    logger.info("🚀 Starting Free Fire Ban Checker Bot...")
+    logger.info("👨‍💻 Developer: Digamber Raj")
+    logger.info("🔧 Bot Token Present: Yes")
     
     # Check API status before starting
-    print("🔍 Checking API connectivity...")
+    logger.info("🔍 Checking API connectivity...")
     await check_api_health()
     
-    if api_status["working"]:
-        print("✅ API is working properly")
+    if api_status.working:
+        logger.info("✅ API is working properly")
     else:
-        print("⚠️ API is down, using fallback mode")
+        logger.warning("⚠️ API is down, using fallback mode")
         if USE_MOCK_IF_API_FAILS:
-            print("✅ Fallback mode enabled (mock data)")
+            logger.info("✅ Fallback mode enabled (mock data)")
         else:
-            print("❌ Fallback mode disabled")
+            logger.warning("❌ Fallback mode disabled")
     
-    # Start Flask server in background for keep-alive
-    import threading
-    flask_thread = threading.Thread(target=run_flask, daemon=True)
-    flask_thread.start()
-    print("🌐 Flask keep-alive server started")
+    # Start keep-alive web server on the same event loop
+    web_runner = None
+    try:
+        web_runner = await start_web_server()
+        logger.info("🌐 Keep-alive web server started")
+    except Exception as e:
+        logger.error(f"❌ Web server error: {e}")
+    
+    # On SIGTERM (container stop), close the bot so the cleanup below runs
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, lambda: asyncio.ensure_future(bot.close())
+        )
+    except (NotImplementedError, RuntimeError):
+        pass  # Not supported on this platform (e.g. Windows)
     
     try:
         # Start Discord bot
         await bot.start(BOT_TOKEN)
     except discord.errors.LoginFailure:
-        print("❌ FAILED TO LOGIN: Invalid Discord bot token!")
-        print("💡 Please check your DISCORD_BOT_TOKEN environment variable.")
+        logger.error("❌ FAILED TO LOGIN: Invalid Discord bot token!")
+        logger.error("💡 Please check your DISCORD_BOT_TOKEN environment variable.")
         sys.exit(1)
     except Exception as e:
-        print(f"❌ Bot startup error: {e}")
+        logger.error(f"❌ Bot startup error: {e}")
         sys.exit(1)
+    finally:
+        # Write any pending config change before exiting
+        if _saver_task:
+            _saver_task.cancel()
+        await flush_allowed_channels()
+        
+        # Release pooled HTTP connections and the web server
+        await close_session()
+        if web_runner:
+            await web_runner.cleanup()
 
 def main():
     """Main entry point"""
+    log_listener = setup_logging()
     try:
         asyncio.run(start_bot())
     except KeyboardInterrupt:
-        print("\n👋 Bot shutting down...")
+        logger.info("👋 Bot shutting down...")
     except Exception as e:
-        print(f"❌ Fatal error: {e}")
+        logger.error(f"❌ Fatal error: {e}")
         sys.exit(1)
+    finally:
+        # Flush queued log records before exiting
+        log_listener.stop()
 
 if __name__ == "__main__":
     main()
@@ -3,15 +3,31 @@ Utility functions for Free Fire Ban Checker
 Helper module for API calls, embed building, and translations
 """
 
+from __future__ import annotations
+
 import json
+import asyncio
 import aiohttp
+import functools
+import hashlib
+import logging
 import os
-import random
-from typing import Dict, Any, Optional
-from datetime import datetime
+import re
+import time
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+from datetime import datetime, timezone
 
 import discord
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, fall back to stdlib json
+    orjson = None
+
+# Shares the bot's logger; handlers are configured by app.setup_logging()
+logger = logging.getLogger("banbot")
+
 # ============================================================================
 # Constants
 # ============================================================================
@@ -23,6 +39,9 @@ NOT_BANNED_EMOJI = "<a:emoji_18:1430082305032192000>"
 # Config file path
 CONFIG_FILE = "bot_config.json"
 
+# Valid Free Fire player ID: 6-20 ASCII digits
+_PID_RE = re.compile(r'[0-9]{6,20}')
+
 # Mock player names for demo mode
 MOCK_PLAYER_NAMES = [
     "ProPlayer", "ShadowNinja", "FireStorm", "IceQueen", "DarkKnight",
@@ -31,6 +50,30 @@ MOCK_PLAYER_NAMES = [
     "SteelTitan", "NightWolf", "SunFlare", "MoonDancer", "StarChaser"
 ]
 
+# ============================================================================
+# JSON Helpers
+# ============================================================================
+
+def json_dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes (uses orjson when installed)
+    """
+    if orjson is not None:
+        # Allow int dict keys (guild IDs) like the stdlib json module does
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+def json_loads(data):
+    """
+    Parse JSON from bytes or str (uses orjson when installed)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 # ============================================================================
 # Mock Data Functions (For when API is down)
 # ============================================================================
@@ -45,39 +88,71 @@ def mock_player_status(player_id: str) -> Dict[str, Any]:
     Returns:
         Mock player status dictionary
     """
-    # Generate random but deterministic ban status based on player ID
-    # This ensures same ID always gets same result
-    random.seed(hash(player_id) % 1000)
+    # Derive a deterministic ban status from a stable hash of the player ID.
+    # Unlike hash(), blake2b is not salted per process, and nothing here
+    # touches the global RNG shared with the rest of the bot.
+    h = hashlib.blake2b(player_id.encode(), digest_size=8).digest()
     
     # 30% chance of being banned
-    is_banned = random.random() < 0.3
+    is_banned = h[0] * 100 < 30 * 256
     
-    # Pick a random name
-    player_name = random.choice(MOCK_PLAYER_NAMES)
+    # Pick a name from the same digest
+    player_name = MOCK_PLAYER_NAMES[h[1] % len(MOCK_PLAYER_NAMES)]
     
     return {
         'id': player_id,
         'name': player_name,
         'banned': is_banned,
         'mock': True,  # Flag to indicate mock data
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': datetime.now(timezone.utc).isoformat()
     }
 
 # ============================================================================
 # Configuration Functions
 # ============================================================================
 
-def save_bot_config(data: Dict[str, Any]):
+def _sync_save(config_bytes: bytes, path: str) -> bool:
     """
-    Save configuration to file
+    Atomically write pre-serialized config bytes to path
+    
+    Writes to a temp file and renames it over the config, so a crash
+    mid-write can't leave a truncated bot_config.json behind.
     """
+    tmp_file = path + ".tmp"
     try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(tmp_file, 'wb') as f:
+            f.write(config_bytes)
+        os.replace(tmp_file, path)
         return True
     except Exception as e:
-        print(f"Error saving config: {e}")
+        logger.warning(f"⚠️ Error saving config: {e}")
+        return False
+
+def save_bot_config(data: Dict[str, Any]) -> bool:
+    """
+    Save configuration to file
+    """
+    try:
+        return _sync_save(json_dumps(data, indent=True), CONFIG_FILE)
+    except Exception as e:
+        logger.warning(f"⚠️ Error saving config: {e}")
+        return False
+
+async def save_bot_config_async(data: Dict[str, Any]) -> bool:
+    """
+    Save configuration without blocking the event loop
+    
+    Serializes on the loop (so data can't change mid-encode), then does
+    the disk write in the default thread pool.
+    """
+    try:
+        config_bytes = json_dumps(data, indent=True)
+    except Exception as e:
+        logger.warning(f"⚠️ Error saving config: {e}")
         return False
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _sync_save, config_bytes, CONFIG_FILE)
 
 def load_bot_config() -> Dict[str, Any]:
     """
@@ -85,8 +160,8 @@ def load_bot_config() -> Dict[str, Any]:
     """
     try:
         if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, 'r') as f:
-                return json.load(f)
+            with open(CONFIG_FILE, 'rb') as f:
+                return json_loads(f.read())
         else:
             return {
                 'allowed_channels': {},
@@ -98,144 +173,158 @@ def load_bot_config() -> Dict[str, Any]:
             'developer': 'Digamber Raj'
         }
     except Exception as e:
-        print(f"Error loading config: {e}")
+        logger.warning(f"⚠️ Error loading config: {e}")
         return {
             'allowed_channels': {},
             'developer': 'Digamber Raj'
         }
 
+# Marks a guild with no channel restriction in is_allowed_channel
+_MISSING = object()
+
 def is_allowed_channel(guild_id: int, channel_id: int, allowed_channels: Dict[int, int]) -> bool:
     """
     Check if a channel is allowed for bot commands
     """
-    if guild_id not in allowed_channels:
-        return True
+    allowed = allowed_channels.get(guild_id, _MISSING)
+    return allowed is _MISSING or allowed == channel_id
+
+# ============================================================================
+# HTTP Session
+# ============================================================================
+
+# Shared HTTP session (created lazily inside the running event loop)
+_session: Optional[aiohttp.ClientSession] = None
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared HTTP session, creating it on first use
     
-    return channel_id == allowed_channels[guild_id]
+    Reusing one session keeps keep-alive connections to the ban check
+    API open instead of doing a new DNS + TCP + TLS handshake per lookup.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=10,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=8, connect=3)
+        )
+    return _session
+
+async def close_session():
+    """
+    Close the shared HTTP session (call on shutdown)
+    """
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
 
 # ============================================================================
 # API Functions
 # ============================================================================
 
-async def get_player_status(player_id: str, api_url: str) -> Optional[Dict[str, Any]]:
+async def get_player_status(player_id: str, api_url: str,
+                            session: aiohttp.ClientSession) -> Optional[Dict[str, Any]]:
     """
     Fetch ban status for a player ID from the API
     
     Args:
         player_id: Free Fire player ID
         api_url: Base API URL
+        session: Shared HTTP session (see get_session)
     
     Returns:
-        Dictionary with player status or None if error
+        Dictionary with player status or None if the API gave a bad answer
+    
+    Raises:
+        aiohttp.ClientError, asyncio.TimeoutError: on transport failures,
+        so the caller can retry them
     """
-    full_url = f"{api_url}{player_id}"
+    full_url = api_url + player_id
     
     try:
-        # Add timeout and better error handling
-        timeout = aiohttp.ClientTimeout(total=10, connect=5, sock_read=5)
-        
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(full_url) as response:
-                if response.status == 200:
-                    data_text = await response.text()
+        async with session.get(full_url) as response:
+            if response.status == 200:
+                body = await response.read()
+                
+                # Try to parse JSON (orjson parses the raw bytes directly)
+                try:
+                    data = json_loads(body)
                     
-                    # Try to parse JSON
-                    try:
-                        data = json.loads(data_text)
-                        
-                        # Validate response format
-                        if isinstance(data, dict) and 'id' in data:
-                            return data
-                        else:
-                            print(f"Invalid API response format for ID {player_id}")
-                            return None
-                            
-                    except json.JSONDecodeError:
-                        print(f"Invalid JSON from API for ID {player_id}")
+                    # Validate response format
+                    if isinstance(data, dict) and 'id' in data:
+                        return data
+                    else:
+                        logger.warning(f"⚠️ Invalid API response format for ID {player_id}")
                         return None
                         
-                else:
-                    print(f"API returned status {response.status} for ID {player_id}")
+                except json.JSONDecodeError:
+                    logger.warning(f"⚠️ Invalid JSON from API for ID {player_id}")
                     return None
                     
-    except aiohttp.ClientError as e:
-        print(f"Network error for ID {player_id}: {type(e).__name__}")
-        return None
-    except asyncio.TimeoutError:
-        print(f"Timeout error for ID {player_id}")
-        return None
+            else:
+                logger.warning(f"⚠️ API returned status {response.status} for ID {player_id}")
+                return None
+                
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        # Transport failures are retried (and logged) by the caller
+        raise
     except Exception as e:
-        print(f"Unexpected error for ID {player_id}: {type(e).__name__}: {e}")
+        logger.error(f"💥 Unexpected error for ID {player_id}: {type(e).__name__}: {e}")
         return None
 
 # ============================================================================
 # Embed Building
 # ============================================================================
 
-def build_embed_response(status_data: Dict[str, Any], lang: str, translations: Dict) -> discord.Embed:
+def build_embed_response(status_data: Dict[str, Any], lang: str) -> discord.Embed:
     """
     Create a Discord embed from player status data
     
     Args:
         status_data: Player status dictionary from API
         lang: Language code ('en' or 'fr')
-        translations: Loaded translations dictionary
     
     Returns:
         Discord Embed object
     """
     # Extract data
     player_id = status_data.get('id', 'N/A')
-    is_banned = status_data.get('banned', False)
+    is_banned = bool(status_data.get('banned', False))
     player_name = status_data.get('name', 'Unknown')
     is_mock = status_data.get('mock', False)
     
-    # Get translation strings
-    t = translations[lang]
-    
-    # Determine title, color, and emoji
-    if is_banned:
-        title = f"{BANNED_EMOJI} {t['banned']['title']}"
-        color = 0xFF0000  # Red
-        status_text = t['banned']['description']
-        footer_text = t['banned']['footer']
-    else:
-        title = f"{NOT_BANNED_EMOJI} {t['not_banned']['title']}"
-        color = 0x00FF00  # Green
-        status_text = t['not_banned']['description']
-        footer_text = t['not_banned']['footer']
+    # All static text for this language/status was prepared at import
+    (title, color, status_text, footer, mock_footer, stale_footer,
+     f_id, f_name, f_status) = _EMBED_TMPL[lang][is_banned]
     
     # Create embed
     embed = discord.Embed(
         title=title,
         color=color,
-        timestamp=datetime.utcnow()
+        timestamp=embed_timestamp()
     )
     
     # Add player information fields
-    embed.add_field(
-        name=t['fields']['player_id'],
-        value=f"`{player_id}`",
-        inline=True
-    )
-    
-    embed.add_field(
-        name=t['fields']['player_name'],
-        value=player_name,
-        inline=True
-    )
-    
-    embed.add_field(
-        name=t['fields']['status'],
-        value=status_text,
-        inline=False
-    )
+    embed.add_field(name=f_id, value=f"`{player_id}`", inline=True)
+    embed.add_field(name=f_name, value=player_name, inline=True)
+    embed.add_field(name=f_status, value=status_text, inline=False)
     
-    # Add mock data indicator if needed
+    # Add mock or cached data indicator if needed
     if is_mock:
-        embed.set_footer(text=f"{footer_text} • Demo Data • Developer: Digamber Raj")
+        embed.set_footer(text=mock_footer)
+    elif status_data.get('stale'):
+        embed.set_footer(text=stale_footer)
     else:
-        embed.set_footer(text=f"{footer_text} • Developer: Digamber Raj")
+        embed.set_footer(text=footer)
     
     return embed
 
@@ -243,11 +332,20 @@ def build_embed_response(status_data: Dict[str, Any], lang: str, translations: D
 # Translation System
 # ============================================================================
 
-def load_translations() -> Dict[str, Dict]:
+def _freeze(value: Any) -> Any:
+    """Recursively wrap dicts in read-only MappingProxyType views"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+@functools.lru_cache(maxsize=1)
+def load_translations() -> Mapping[str, Mapping[str, Any]]:
     """
-    Load all translation strings
+    Load all translation strings (built once, then served from cache)
+    
+    The result is shared by every caller, so it is returned read-only.
     """
-    return {
+    return _freeze({
         'en': {
             'banned': {
                 'title': 'Account Banned',
@@ -304,20 +402,61 @@ def load_translations() -> Dict[str, Dict]:
                 'description': 'Ce bot est actuellement utilisé sur **{count}** serveurs Discord.'
             }
         }
-    }
+    })
+
+def _build_embed_templates(translations: Mapping[str, Mapping[str, Any]]) -> Dict[str, Tuple[Tuple, Tuple]]:
+    """
+    Precompute the static parts of ban status embeds per language
+    
+    Each language maps to a (not_banned, banned) pair, indexed by is_banned.
+    """
+    templates = {}
+    for lang, t in translations.items():
+        pair = []
+        for is_banned in (False, True):
+            if is_banned:
+                section, emoji, color = t['banned'], BANNED_EMOJI, 0xFF0000  # Red
+            else:
+                section, emoji, color = t['not_banned'], NOT_BANNED_EMOJI, 0x00FF00  # Green
+            
+            pair.append((
+                f"{emoji} {section['title']}",
+                color,
+                section['description'],
+                f"{section['footer']} • Developer: Digamber Raj",
+                f"{section['footer']} • Demo Data • Developer: Digamber Raj",
+                f"{section['footer']} • Cached Data • Developer: Digamber Raj",
+                t['fields']['player_id'],
+                t['fields']['player_name'],
+                t['fields']['status'],
+            ))
+        templates[lang] = tuple(pair)
+    return templates
+
+_EMBED_TMPL = _build_embed_templates(load_translations())
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
-def get_guild_count(bot) -> int:
+# [unix_second, datetime] - embed timestamps only have second resolution
+_now_cache = [0, None]
+
+def embed_timestamp() -> datetime:
     """
-    Get the number of guilds the bot is in
+    Current UTC time for embed timestamps, rebuilt once per second
     """
-    return len(bot.guilds)
+    now = int(time.time())
+    if now != _now_cache[0]:
+        _now_cache[0] = now
+        _now_cache[1] = datetime.fromtimestamp(now, timezone.utc)
+    return _now_cache[1]
 
+@functools.lru_cache(maxsize=1024)
 def validate_player_id(player_id: str) -> bool:
     """
-    Validate that a player ID contains only digits
+    Validate that a player ID contains only digits (6-20 characters)
+    
+    Cached because users often re-check the same IDs.
     """
-    return player_id.isdigit() and len(player_id) <= 20 and len(player_id) >= 6
+    return isinstance(player_id, str) and _PID_RE.fullmatch(player_id) is not None